@@ -0,0 +1,97 @@
+import functools
+import json
+import os
+
+try:
+    import mido
+except ImportError:
+    print("Error: mido not installed. Run: pip install mido")
+    exit(1)
+
+PREFERRED_PORT_KEYWORDS = ('reaper', 'daw', 'virtual')
+PORT_CONFIG_FILE = "midi_port.json"  # remembers the last selected port between launches
+
+@functools.lru_cache(maxsize=1)
+def output_names():
+    # Enumerating ports queries CoreMIDI/ALSA, so only do it once per process
+    return tuple(mido.get_output_names())
+
+def find_preferred(names):
+    lowered = [(name, name.lower()) for name in names]
+    return next((name for name, lower in lowered
+                 if any(keyword in lower for keyword in PREFERRED_PORT_KEYWORDS)), None)
+
+def select_interactively(names):
+    preferred = find_preferred(names)
+    
+    print("\nAvailable MIDI output ports:")
+    print("=" * 50)
+    for i, port in enumerate(names):
+        print(f"  {i}: {port}")
+    print("=" * 50)
+    
+    prompt = f"\nSelect MIDI port (0-{len(names)-1})"
+    if preferred:
+        prompt += f" [Enter for {preferred}]"
+    
+    while True:
+        try:
+            choice = input(prompt + ": ")
+            if not choice.strip() and preferred:
+                print(f"Selected MIDI port: {preferred}")
+                return preferred
+            port_index = int(choice)
+            if 0 <= port_index < len(names):
+                selected_port = names[port_index]
+                print(f"Selected MIDI port: {selected_port}")
+                return selected_port
+            else:
+                print(f"Invalid selection. Please enter a number between 0 and {len(names)-1}")
+        except ValueError:
+            print("Invalid input. Please enter a number.")
+        except KeyboardInterrupt:
+            print("\nExiting...")
+            return None
+
+def load_saved_port(config_file=PORT_CONFIG_FILE):
+    if not os.path.exists(config_file):
+        return None
+    
+    try:
+        with open(config_file, 'r') as f:
+            config = json.load(f)
+        return config.get('port') if isinstance(config, dict) else None
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read MIDI port config '{config_file}': {e}")
+        return None
+
+def save_port(port_name, config_file=PORT_CONFIG_FILE):
+    try:
+        with open(config_file, 'w') as f:
+            json.dump({'port': port_name}, f, indent=2)
+    except OSError as e:
+        print(f"Warning: Could not write MIDI port config '{config_file}': {e}")
+
+def select_midi_port(config_file=PORT_CONFIG_FILE):
+    try:
+        names = output_names()
+    except Exception as e:
+        print(f"Error getting MIDI ports: {e}")
+        print("Try installing python-rtmidi: pip install python-rtmidi")
+        return None
+    
+    if not names:
+        print("No MIDI output ports found")
+        print("Make sure you have MIDI software running (like Reaper) or virtual MIDI ports set up")
+        return None
+    
+    # Reuse the saved port while it is still available, so restarts stay headless
+    saved_port = load_saved_port(config_file)
+    if saved_port in names:
+        print(f"Using saved MIDI port: {saved_port}")
+        return saved_port
+    
+    selected_port = select_interactively(names)
+    if selected_port:
+        save_port(selected_port, config_file)
+    return selected_port
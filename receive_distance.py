@@ -2,9 +2,13 @@ import serial.tools.list_ports
 import serial
 import time
 import random
+import heapq
+import itertools
+import select
 import threading
+import queue
 import os
-import glob
+import json
 import re
 from pathlib import Path
 
@@ -21,7 +25,13 @@ except ImportError:
     print("Error: mutagen not installed. Run: pip install mutagen")
     exit(1)
 
+from midi_utils import select_midi_port
+
 BAUD_RATE = 9600
+SERIAL_TIMEOUT = 0.5  # seconds a serial read blocks waiting for a line
+SELECT_TIMEOUT = 1.0  # seconds to wait for the serial port to become readable
+MAX_LINE_LENGTH = 64  # bytes; bounds a read if the sensor sends noise without newlines
+DISTANCE_QUEUE_SIZE = 64  # readings buffered between the serial reader and main loop
 PROXIMITY_THRESHOLD = 200
 MIDI_CHANNEL = 0
 DETECTION_COOLDOWN = 5
@@ -29,93 +39,103 @@ MAX_QUEUED_TRACKS = 10
 SUBSEQUENT_TRACK_BASE_DELAY = 300  # 5 minutes base delay for tracks 2+
 TRACK_DELAY_INCREMENT = 30  # 1 minute increment between tracks
 AUDIO_FOLDER = "audio"
+AUDIO_EXTENSIONS = {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma'}
+DURATION_CACHE_FILE = "audio_durations.json"  # cached track lengths, keyed by filename
 EMPTY_QUEUE_TIMEOUT = 300  # 10 minutes in seconds
+NOTE_GATE_TIME = 0.1  # seconds between a trigger's note_on and note_off
+
+# Matches raw Arduino lines like b"Distance: 123.45 cm\r\n", capturing whole cm and tenths
+_DISTANCE_RE = re.compile(rb'^Distance:\s*(\d+)(?:\.(\d))?')
+PROXIMITY_THRESHOLD_X10 = PROXIMITY_THRESHOLD * 10  # threshold in tenths of a cm
+
+# Serial port descriptions/device names and USB (vid, pid) pairs used by Arduino boards
+_ARDUINO_PORT_RE = re.compile(r'arduino|ch340|cp2102|ftdi|usbmodem|usbserial|ttyusb|ttyacm', re.IGNORECASE)
+_ARDUINO_USB_IDS = frozenset({(0x2341, 0x0043), (0x2341, 0x0001), (0x1A86, 0x7523), (0x10C4, 0xEA60)})
 
 def find_arduino_port():
     ports = serial.tools.list_ports.comports()
     
     for port in ports:
-        if any(keyword in port.description.lower() for keyword in ['arduino', 'ch340', 'cp2102', 'ftdi']):
-            return port.device
-        
-        if port.vid and port.pid:
-            if (port.vid == 0x2341 and port.pid in [0x0043, 0x0001]) or \
-               (port.vid == 0x1A86 and port.pid == 0x7523) or \
-               (port.vid == 0x10C4 and port.pid == 0xEA60):
-                return port.device
-        
-        device = port.device.lower()
-        if any(pattern in device for pattern in ['usbmodem', 'usbserial', 'ttyusb', 'ttyacm']):
+        if (_ARDUINO_PORT_RE.search(port.description or '') or
+                _ARDUINO_PORT_RE.search(port.device) or
+                (port.vid, port.pid) in _ARDUINO_USB_IDS):
             return port.device
     
     return None
 
-def create_audio_dictionary(audio_folder=AUDIO_FOLDER):
+def create_audio_dictionary(audio_folder=AUDIO_FOLDER, cache_file=DURATION_CACHE_FILE):
     audio_dict = {}
-    audio_extensions = ('.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a', '.wma')
     
     if not os.path.exists(audio_folder):
         print(f"Warning: Audio folder '{audio_folder}' not found")
         return audio_dict
     
-    audio_files = []
-    for ext in audio_extensions:
-        audio_files.extend(glob.glob(os.path.join(audio_folder, f"*{ext}")))
-        audio_files.extend(glob.glob(os.path.join(audio_folder, f"*{ext.upper()}")))
+    # Skip dotfiles like glob did, e.g. macOS AppleDouble "._60.wav" companions
+    with os.scandir(audio_folder) as entries:
+        audio_files = [entry.path for entry in entries
+                       if not entry.name.startswith('.') and entry.is_file()
+                       and os.path.splitext(entry.name)[1].lower() in AUDIO_EXTENSIONS]
     
     print(f"Found {len(audio_files)} audio files in '{audio_folder}'")
     
+    cached_durations = load_duration_cache(cache_file)
+    new_cache = {}
+    
     for file_path in audio_files:
+        filename = os.path.basename(file_path)
         try:
-            audio_file = MutagenFile(file_path)
-            if audio_file is not None and hasattr(audio_file, 'info'):
-                length = audio_file.info.length
-                filename = os.path.basename(file_path)
-                audio_dict[filename] = length
-                print(f"  {filename}: {length:.2f} seconds")
+            stat = os.stat(file_path)
+            cached = cached_durations.get(filename)
+            # Anything that isn't a well-formed entry for this exact file is a cache miss
+            if (isinstance(cached, dict) and _is_duration(cached.get("length")) and
+                    cached.get("mtime_ns") == stat.st_mtime_ns and cached.get("size") == stat.st_size):
+                length = cached["length"]
             else:
-                print(f"  Warning: Could not read audio info for {os.path.basename(file_path)}")
+                audio_file = MutagenFile(file_path)
+                if audio_file is None or not hasattr(audio_file, 'info'):
+                    print(f"  Warning: Could not read audio info for {filename}")
+                    continue
+                length = audio_file.info.length
+                if not _is_duration(length):
+                    print(f"  Warning: Could not read audio length for {filename}")
+                    continue
+            
+            print(f"  {filename}: {length:.2f} seconds")
+            audio_dict[filename] = length
+            new_cache[filename] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "length": length}
         except Exception as e:
-            print(f"  Error reading {os.path.basename(file_path)}: {e}")
+            print(f"  Error reading {filename}: {e}")
+    
+    if new_cache != cached_durations:
+        save_duration_cache(cache_file, new_cache)
     
     return audio_dict
 
-def select_midi_port():
-    try:
-        output_ports = mido.get_output_names()
-    except Exception as e:
-        print(f"Error getting MIDI ports: {e}")
-        print("Try installing python-rtmidi: pip install python-rtmidi")
-        return None
-    
-    if not output_ports:
-        print("No MIDI output ports found")
-        print("Make sure you have MIDI software running (like Reaper) or virtual MIDI ports set up")
-        return None
-    
-    print("\nAvailable MIDI output ports:")
-    print("=" * 50)
-    for i, port in enumerate(output_ports):
-        print(f"  {i}: {port}")
-    print("=" * 50)
+def _is_duration(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def load_duration_cache(cache_file=DURATION_CACHE_FILE):
+    if not os.path.exists(cache_file):
+        return {}
     
-    while True:
-        try:
-            choice = input(f"\nSelect MIDI port (0-{len(output_ports)-1}): ")
-            port_index = int(choice)
-            if 0 <= port_index < len(output_ports):
-                selected_port = output_ports[port_index]
-                print(f"Selected MIDI port: {selected_port}")
-                return selected_port
-            else:
-                print(f"Invalid selection. Please enter a number between 0 and {len(output_ports)-1}")
-        except ValueError:
-            print("Invalid input. Please enter a number.")
-        except KeyboardInterrupt:
-            print("\nExiting...")
-            return None
+    try:
+        with open(cache_file, 'r') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read duration cache '{cache_file}': {e}")
+        return {}
+
+def save_duration_cache(cache_file, cache):
+    try:
+        with open(cache_file, 'w') as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"Warning: Could not write duration cache '{cache_file}': {e}")
 
 class MIDITrackTrigger:
+    _NOTE_RE = re.compile(r'(\d+)')
+    
     def __init__(self, midi_channel=0, audio_dict=None):
         self.midi_channel = midi_channel
         self.midi_port = None
@@ -124,12 +144,26 @@ class MIDITrackTrigger:
         self.lock = threading.Lock()
         self.audio_dict = audio_dict or {}
         self.note_to_file_map = {}
-        self.playing_tracks = {}
-        self.active_timers = []
+        self.note_to_duration_map = {}
+        self.playing_tracks = {}  # play_id -> track info, so repeats of one note are tracked separately
+        self._play_ids = itertools.count()
         self.last_queue_activity = time.time()
         self.empty_queue_timer = None
         self.queue_position = 0
         
+        # Single timekeeping thread: heap of (fire_time, seq, callback, args)
+        self._sched_heap = []
+        self._sched_seq = itertools.count()
+        self._sched_cv = threading.Condition(self.lock)
+        self._sched_running = True
+        self._sched_thread = threading.Thread(target=self._run_scheduler, daemon=True)
+        self._sched_thread.start()
+        
+        # Single MIDI writer thread, so senders never block on the port's own lock
+        self._midi_out_queue = queue.SimpleQueue()
+        self._writer_thread = threading.Thread(target=self._run_midi_writer, daemon=True)
+        self._writer_thread.start()
+        
         self._create_note_mapping()
         
         port_name = select_midi_port()
@@ -143,11 +177,65 @@ class MIDITrackTrigger:
             print("No MIDI port available")
         
         # Start empty queue timer since queue starts empty
-        self._reset_empty_queue_timer()
+        with self.lock:
+            self._reset_empty_queue_timer()
+    
+    def _schedule(self, delay, callback, *args):
+        # Caller must hold self.lock
+        entry = (time.monotonic() + delay, next(self._sched_seq), callback, args)
+        heapq.heappush(self._sched_heap, entry)
+        self._sched_cv.notify()
+        return entry
+    
+    def _cancel(self, entry):
+        # Caller must hold self.lock; removing it now keeps cancelled entries
+        # from piling up in the heap on a long-running install
+        try:
+            self._sched_heap.remove(entry)
+        except ValueError:
+            return  # already fired
+        heapq.heapify(self._sched_heap)
+    
+    def _run_scheduler(self):
+        while True:
+            with self._sched_cv:
+                while self._sched_running:
+                    if not self._sched_heap:
+                        self._sched_cv.wait()
+                        continue
+                    
+                    wait_time = self._sched_heap[0][0] - time.monotonic()
+                    if wait_time <= 0:
+                        _, _, callback, args = heapq.heappop(self._sched_heap)
+                        break
+                    self._sched_cv.wait(wait_time)
+                else:
+                    return
+            
+            # Callbacks take self.lock themselves, so run them after releasing it
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Scheduler error in {callback.__name__}: {e}")
+    
+    def _run_midi_writer(self):
+        while True:
+            item = self._midi_out_queue.get()
+            if item is None:
+                return
+            
+            # play_id is set for note_on messages so a failed send can undo that play
+            message, play_id = item
+            try:
+                self.midi_port.send(message)
+            except Exception as e:
+                print(f"MIDI error: {e}")
+                if play_id is not None:
+                    self._play_failed(play_id)
     
     def _extract_note_from_filename(self, filename):
         name_without_ext = os.path.splitext(filename)[0]
-        match = re.search(r'(\d+)', name_without_ext)
+        match = self._NOTE_RE.search(name_without_ext)
         if match:
             note_num = int(match.group(1))
             if 0 <= note_num <= 127:
@@ -162,12 +250,13 @@ class MIDITrackTrigger:
         mapped_files = []
         unmapped_files = []
         
-        for filename in self.audio_dict.keys():
+        for filename, duration in self.audio_dict.items():
             note = self._extract_note_from_filename(filename)
             if note is not None:
                 self.note_to_file_map[note] = filename
+                self.note_to_duration_map[note] = duration
                 mapped_files.append((note, filename))
-                print(f"MIDI Note {note} -> {filename} ({self.audio_dict[filename]:.2f}s)")
+                print(f"MIDI Note {note} -> {filename} ({duration:.2f}s)")
             else:
                 unmapped_files.append(filename)
                 print(f"Warning: Could not extract MIDI note from filename: {filename}")
@@ -210,10 +299,8 @@ class MIDITrackTrigger:
             print(f"Queued {filename} (Note {track_note}) - position {self.queue_position}, will play in {track_delay/60:.1f} minutes ({self.queued_count} in queue)")
             
             # Schedule track to play after delay
-            timer = threading.Timer(track_delay, self._trigger_track, args=[track_note])
-            self.active_timers.append(timer)
-            timer.start()
-            print(f"Timer started for track {track_note}, will trigger in {track_delay} seconds")
+            self._schedule(track_delay, self._trigger_track, track_note)
+            print(f"Scheduled track {track_note}, will trigger in {track_delay} seconds")
             
             self.last_queue_activity = time.time()
             self._reset_empty_queue_timer()
@@ -227,47 +314,64 @@ class MIDITrackTrigger:
             return
         
         filename = self.note_to_file_map.get(track_note, "Unknown")
-        duration = self.audio_dict.get(filename, 0)
+        duration = self.note_to_duration_map.get(track_note, 0)
         
+        # Only the counter updates need the lock; the empty-queue timer is
+        # already cleared while anything is queued, so no reset is needed here
         with self.lock:
             self.queued_count -= 1
             self.playing_count += 1
-            self.playing_tracks[track_note] = {"filename": filename, "start_time": time.time()}
-            print(f"Playing scheduled track {track_note} (Note {track_note}) - {filename}")
-            print(f"Queue: {self.queued_count} queued, {self.playing_count} playing")
-            
-            if self.queued_count == 0 and self.playing_count == 1:
-                self._reset_empty_queue_timer()
+            play_id = next(self._play_ids)
+            self.playing_tracks[play_id] = {"note": track_note, "filename": filename, "start_time": time.time()}
+            queued_count, playing_count = self.queued_count, self.playing_count
         
-        try:
-            note_on = mido.Message('note_on', channel=self.midi_channel, note=track_note, velocity=127)
-            self.midi_port.send(note_on)
-            
-            time.sleep(0.1)
-            
-            note_off = mido.Message('note_off', channel=self.midi_channel, note=track_note, velocity=0)
-            self.midi_port.send(note_off)
-            
-            print(f"MIDI trigger sent for track {track_note} - will finish in {duration:.2f}s")
-            
-            if duration > 0:
-                cleanup_timer = threading.Timer(duration, self._track_finished, args=[track_note])
-                cleanup_timer.start()
-            
-        except Exception as e:
-            print(f"MIDI error: {e}")
+        print(f"Playing scheduled track {track_note} (Note {track_note}) - {filename}")
+        print(f"Queue: {queued_count} queued, {playing_count} playing")
+        
+        self._send_note_on(track_note, play_id)
+        
+        if duration > 0:
             with self.lock:
-                self.playing_count -= 1
-                if track_note in self.playing_tracks:
-                    del self.playing_tracks[track_note]
+                # The writer may already have dropped this play if its note_on failed
+                if play_id in self.playing_tracks:
+                    self.playing_tracks[play_id]["finish_entry"] = self._schedule(duration, self._track_finished, play_id)
+        
+        print(f"MIDI trigger queued for track {track_note} - will finish in {duration:.2f}s")
+    
+    def _send_note_on(self, track_note, play_id):
+        note_on = mido.Message('note_on', channel=self.midi_channel, note=track_note, velocity=127)
+        self._midi_out_queue.put((note_on, play_id))
+        
+        # Release the note from the scheduler instead of sleeping on it
+        with self.lock:
+            self._schedule(NOTE_GATE_TIME, self._send_note_off, track_note)
+    
+    def _send_note_off(self, track_note):
+        note_off = mido.Message('note_off', channel=self.midi_channel, note=track_note, velocity=0)
+        self._midi_out_queue.put((note_off, None))
+    
+    def _play_failed(self, play_id):
+        # Undo the bookkeeping for a play whose note_on never reached the port
+        with self.lock:
+            track_info = self.playing_tracks.pop(play_id, None)
+            if track_info is None:
+                return
+            if "finish_entry" in track_info:
+                self._cancel(track_info["finish_entry"])
+            self.playing_count -= 1
+            print(f"Dropped track {track_info['note']} ({track_info['filename']}) - {self.queued_count} queued, {self.playing_count} playing")
+            
+            if self.queued_count == 0 and self.playing_count == 0:
+                self.queue_position = 0
+                self._reset_empty_queue_timer()
     
-    def _track_finished(self, track_note):
+    def _track_finished(self, play_id):
         with self.lock:
-            if track_note in self.playing_tracks:
-                track_info = self.playing_tracks[track_note]
+            if play_id in self.playing_tracks:
+                track_info = self.playing_tracks[play_id]
                 elapsed = time.time() - track_info["start_time"]
-                print(f"Track {track_note} ({track_info['filename']}) finished after {elapsed:.2f}s")
-                del self.playing_tracks[track_note]
+                print(f"Track {track_info['note']} ({track_info['filename']}) finished after {elapsed:.2f}s")
+                del self.playing_tracks[play_id]
                 self.playing_count -= 1
                 print(f"Queue status: {self.queued_count} queued, {self.playing_count} playing")
                 
@@ -276,39 +380,95 @@ class MIDITrackTrigger:
                     self._reset_empty_queue_timer()
     
     def _reset_empty_queue_timer(self):
-        if self.empty_queue_timer and self.empty_queue_timer.is_alive():
-            self.empty_queue_timer.cancel()
+        # Caller must hold self.lock
+        if self.empty_queue_timer:
+            self._cancel(self.empty_queue_timer)
         
         if self.queued_count == 0 and self.playing_count == 0:
             print(f"Queue is empty - setting 20 minute timer for auto-queue")
-            self.empty_queue_timer = threading.Timer(EMPTY_QUEUE_TIMEOUT, self._auto_queue_track)
-            self.empty_queue_timer.start()
+            self.empty_queue_timer = self._schedule(EMPTY_QUEUE_TIMEOUT, self._auto_queue_track)
         else:
             self.empty_queue_timer = None
     
     def _auto_queue_track(self):
         with self.lock:
-            if self.queued_count == 0 and self.playing_count == 0:
-                print("Auto-queuing track after 20 minutes of empty queue")
-                self.queue_random_track()
+            self.empty_queue_timer = None
+            queue_empty = self.queued_count == 0 and self.playing_count == 0
+        
+        # queue_random_track takes the lock itself
+        if queue_empty:
+            print("Auto-queuing track after 20 minutes of empty queue")
+            self.queue_random_track()
     
     def close(self):
-        # Cancel all active timers
+        # Stop the scheduler first; a callback it is running may still schedule a note_off
         with self.lock:
-            for timer in self.active_timers:
-                if timer.is_alive():
-                    timer.cancel()
-                    print(f"Cancelled active timer")
-            self.active_timers.clear()
-            
-            if self.empty_queue_timer and self.empty_queue_timer.is_alive():
-                self.empty_queue_timer.cancel()
-                print("Cancelled empty queue timer")
+            self._sched_running = False
+            self._sched_cv.notify()
+        
+        self._sched_thread.join(timeout=1.0)
+        
+        # Drop everything still pending, keeping note_offs to send below
+        with self.lock:
+            pending_note_offs = [entry[3] for entry in self._sched_heap if entry[2] == self._send_note_off]
+            pending = len(self._sched_heap) - len(pending_note_offs)
+            self._sched_heap.clear()
+            self.empty_queue_timer = None
+            if pending:
+                print(f"Cancelled {pending} scheduled events")
+        
+        if self.midi_port:
+            # Don't leave notes hanging if we stop inside a trigger's gate time
+            for args in pending_note_offs:
+                self._send_note_off(*args)
+        
+        # Let the writer drain everything queued so far before the port closes
+        self._midi_out_queue.put(None)
+        self._writer_thread.join(timeout=1.0)
         
         if self.midi_port:
             self.midi_port.close()
             print("MIDI port closed")
 
+def put_latest(distance_queue, item):
+    # Drop the oldest reading when full so the consumer never sees stale data
+    try:
+        distance_queue.put_nowait(item)
+    except queue.Full:
+        try:
+            distance_queue.get_nowait()
+        except queue.Empty:
+            pass
+        distance_queue.put_nowait(item)
+
+def reader_thread(arduino, distance_queue, stop_event):
+    # select() needs a real file descriptor, which pyserial only has on POSIX
+    try:
+        serial_fd = arduino.fileno()
+    except (AttributeError, OSError):
+        serial_fd = None
+    
+    try:
+        while not stop_event.is_set():
+            # Sleep in the kernel until the port has bytes to read
+            if serial_fd is not None:
+                ready, _, _ = select.select([serial_fd], [], [], SELECT_TIMEOUT)
+                if not ready:
+                    continue
+            
+            # Blocks until a full line arrives, MAX_LINE_LENGTH bytes are read or SERIAL_TIMEOUT elapses
+            line = arduino.read_until(b'\n', MAX_LINE_LENGTH)
+            if not line:
+                continue
+            
+            match = _DISTANCE_RE.match(line)
+            if match:
+                # Fixed-point distance in tenths of a cm, e.g. b"123" + b"4" -> 1234
+                put_latest(distance_queue, int(match.group(1) + (match.group(2) or b'0')))
+    except Exception as e:
+        # Hand any failure to main() so a dead reader never goes unnoticed
+        put_latest(distance_queue, e)
+
 def main():
     try:
         print("Loading audio file dictionary...")
@@ -323,9 +483,15 @@ def main():
             print("Please check that the Arduino is connected and try again.")
             return
         
-        arduino = serial.Serial(serial_port, BAUD_RATE, timeout=1)
+        arduino = serial.Serial(serial_port, BAUD_RATE, timeout=SERIAL_TIMEOUT)
         print(f"Connected to Arduino on {serial_port}")
         
+        # Ask the driver to deliver bytes immediately (Linux only; other platforms raise)
+        try:
+            arduino.set_low_latency_mode(True)
+        except (NotImplementedError, ValueError, OSError, AttributeError) as e:
+            print(f"Warning: Could not enable low latency mode: {e}")
+        
         time.sleep(2)
         
         person_detected = False
@@ -333,30 +499,37 @@ def main():
         
         print(f"Monitoring for proximity within {PROXIMITY_THRESHOLD} cm...")
         
+        # Serial reads run on their own thread so MIDI work never backs up the port
+        distance_queue = queue.Queue(maxsize=DISTANCE_QUEUE_SIZE)
+        stop_reading = threading.Event()
+        reader = threading.Thread(target=reader_thread, args=(arduino, distance_queue, stop_reading), daemon=True)
+        reader.start()
+        
         while True:
-            if arduino.in_waiting > 0:
-                data = arduino.readline().decode('utf-8').strip()
-                if data and data.startswith("Distance:"):
-                        try:
-                            distance_str = data.split(":")[1].strip().replace(" cm", "")
-                            distance = float(distance_str)
-                            current_time = time.time()
-                            
-                            if distance <= PROXIMITY_THRESHOLD:
-                                if not person_detected and (current_time - last_detection_time) > DETECTION_COOLDOWN:
-                                    person_detected = True
-                                    last_detection_time = current_time
-                                    print(f"PROXIMITY DETECTED! Person within {distance} cm - Queuing MIDI track")
-                                    midi_trigger.queue_random_track()
-                            else:
-                                if person_detected:
-                                    person_detected = False
-                                    print("Person moved away from sensor")
-                            
-                        except (ValueError, IndexError):
-                            pass
+            try:
+                reading = distance_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            
+            # The reader hands over the error that stopped it so it is reported here
+            if isinstance(reading, serial.SerialException):
+                raise reading
+            if isinstance(reading, Exception):
+                print(f"Error: Lost contact with the Arduino sensor. {reading}")
+                break
+            distance_x10 = reading
+            
+            current_time = time.time()
             
-            time.sleep(0.1)
+            # Fire only on the rising edge into range, outside the cooldown
+            in_range = distance_x10 <= PROXIMITY_THRESHOLD_X10
+            if in_range and not person_detected and (current_time - last_detection_time) > DETECTION_COOLDOWN:
+                last_detection_time = current_time
+                print(f"PROXIMITY DETECTED! Person within {distance_x10 / 10} cm - Queuing MIDI track")
+                midi_trigger.queue_random_track()
+            elif person_detected and not in_range:
+                print("Person moved away from sensor")
+            person_detected = in_range
             
     except serial.SerialException as e:
         print(f"Error: Could not connect to Arduino. {e}")
@@ -364,6 +537,9 @@ def main():
     except KeyboardInterrupt:
         print("\nExiting...")
     finally:
+        if 'reader' in locals():
+            stop_reading.set()
+            reader.join(timeout=SELECT_TIMEOUT + SERIAL_TIMEOUT)
         if 'arduino' in locals():
             arduino.close()
         if 'midi_trigger' in locals():
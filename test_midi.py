@@ -7,38 +7,7 @@ except ImportError:
     print("Error: mido not installed. Run: pip install mido")
     exit(1)
 
-def select_midi_port():
-    try:
-        output_ports = mido.get_output_names()
-    except Exception as e:
-        print(f"Error getting MIDI ports: {e}")
-        return None
-    
-    if not output_ports:
-        print("No MIDI output ports found")
-        return None
-    
-    print("\nAvailable MIDI output ports:")
-    print("=" * 50)
-    for i, port in enumerate(output_ports):
-        print(f"  {i}: {port}")
-    print("=" * 50)
-    
-    while True:
-        try:
-            choice = input(f"\nSelect MIDI port (0-{len(output_ports)-1}): ")
-            port_index = int(choice)
-            if 0 <= port_index < len(output_ports):
-                selected_port = output_ports[port_index]
-                print(f"Selected MIDI port: {selected_port}")
-                return selected_port
-            else:
-                print(f"Invalid selection. Please enter a number between 0 and {len(output_ports)-1}")
-        except ValueError:
-            print("Invalid input. Please enter a number.")
-        except KeyboardInterrupt:
-            print("\nExiting...")
-            return None
+from midi_utils import select_midi_port
 
 def main():
     port_name = select_midi_port()